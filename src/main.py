@@ -2,10 +2,12 @@
 # -*- coding: utf-8 -*-
 """Main CLI application."""
 
+from functools import lru_cache
 from math import floor
-from math import log
+from math import log1p
 from math import sqrt
-import click
+import argparse
+import sys
 
 #: Kerbal g₀ value
 KSP_G0 = 9.82
@@ -53,105 +55,122 @@ KSP_ENGINES = {
     },
 }
 
-
-@click.group()
-def cli():
-    pass
+#: Engines data flattened to
+#: ``(thrust_atm, thrust_vac, isp_atm, isp_vac, mass)`` tuples
+_ENG = {
+    k: (v['thrust_atm'], v['thrust_vac'], v['isp_atm'], v['isp_vac'], v['mass'])
+    for k, v in KSP_ENGINES.items()
+}
 
 
 def _dv(empty, full, isp):
-    return isp * KSP_G0 * log(full / empty)
+    return isp * KSP_G0 * log1p((full - empty) / empty)
 
 
-def _twr(body, mass, thrust):
-    return thrust / (mass * 1000 * KSP_BODIES[body]['g0'])
+def _twr(g0, mass, thrust):
+    return thrust / (mass * 1000 * g0)
 
 
-def _orbital_spd(body, height):
-    return sqrt(KSP_BODIES[body]['std_grav_param'] / (KSP_BODIES[body]['radius'] + height))
+def _orbital_spd(mu, radius, height):
+    return sqrt(mu / (radius + height))
 
 
+@lru_cache(maxsize=64)
 def _engine_stats(engines):
-    def thr_sum(spec):
-        return sum(KSP_ENGINES[e]['thrust_{}'.format(spec)] for e in engines)
-
-    def flow_sum(spec):
-        return sum(
-            KSP_ENGINES[e]['thrust_{}'.format(spec)] / KSP_ENGINES[e]['isp_{}'.format(spec)]
-            for e in engines)
-
-    thr_atm = thr_sum('atm')
-    thr_vac = thr_sum('vac')
-    isp_atm = thr_atm / flow_sum('atm')
-    isp_vac = thr_vac / flow_sum('vac')
+    thr_atm = thr_vac = flow_atm = flow_vac = mass = 0.0
+    for e in engines:
+        e_thr_atm, e_thr_vac, e_isp_atm, e_isp_vac, e_mass = _ENG[e]
+        mass += e_mass
+        thr_atm += e_thr_atm
+        thr_vac += e_thr_vac
+        flow_atm += e_thr_atm / e_isp_atm
+        flow_vac += e_thr_vac / e_isp_vac
 
-    return thr_atm, thr_vac, isp_atm, isp_vac
+    return mass, thr_atm, thr_vac, thr_atm / flow_atm, thr_vac / flow_vac
 
 
-@click.command()
-@click.argument('empty', type=click.FLOAT)
-@click.argument('full', type=click.FLOAT)
-@click.argument('isp', type=click.FLOAT)
 def dv(empty, full, isp):
     """Compute Δv."""
-    print('Δv = {} m/s'.format(round(_dv(empty, full, isp), 2)))
+    sys.stdout.write(f'Δv = {_dv(empty, full, isp):.2f} m/s\n')
 
 
-@click.command()
-@click.argument('body', type=click.Choice(KSP_BODIES.keys()))
-@click.argument('mass', type=click.FLOAT)
-@click.argument('thrust', type=click.FLOAT)
 def twr(body, mass, thrust):
     """Compute stage TWR."""
-    print('TWR = {}'.format(round(_twr(body, mass, thrust), 2)))
+    sys.stdout.write(f"TWR = {_twr(KSP_BODIES[body]['g0'], mass, thrust):.2f}\n")
 
 
-@click.command()
-@click.argument('body', type=click.Choice(KSP_BODIES.keys()))
-@click.argument('height', type=click.FLOAT)
 def orbital_spd(body, height):
     """Compute speed for given orbit around a body."""
-    print('Speed = {}'.format(round(_orbital_spd(body, height), 2)))
+    b = KSP_BODIES[body]
+    speed = _orbital_spd(b['std_grav_param'], b['radius'], height)
+    sys.stdout.write(f'Speed = {speed:.2f}\n')
 
 
-@click.command()
-@click.argument('payload', type=click.FLOAT)
-@click.argument('tank_dry', type=click.FLOAT)
-@click.argument('tank_full', type=click.FLOAT)
-@click.argument('n_tanks', type=click.FLOAT)
-@click.argument('engines', type=click.Choice(KSP_ENGINES.keys()), nargs=-1, required=True)
-@click.option('--body', type=click.Choice(KSP_BODIES.keys()), default='kerbin')
 def stage(payload, tank_dry, tank_full, n_tanks, engines, body):
     """Compute stage info for given configuration."""
-    eng_mass = sum(KSP_ENGINES[e]['mass'] for e in engines)
-    thr_atm, thr_vac, isp_atm, isp_vac = _engine_stats(engines)
+    eng_mass, thr_atm, thr_vac, isp_atm, isp_vac = _engine_stats(tuple(sorted(engines)))
     dry = payload + eng_mass + tank_dry * n_tanks
     full = payload + eng_mass + tank_full * n_tanks
+    g0 = KSP_BODIES[body]['g0']
 
-    print('Dry mass:   {} t'.format(round(dry, 1)))
-    print('Total mass: {} t'.format(round(full, 1)))
-    print('Δv (atm):   {} m/s'.format(floor(_dv(dry, full, isp_atm))))
-    print('Δv (vac):   {} m/s'.format(floor(_dv(dry, full, isp_vac))))
-    print('TWR (atm):  {} ({})'.format(round(_twr(body, full, thr_atm), 2), body))
-    print('TWR (vac):  {} ({})'.format(round(_twr(body, full, thr_vac), 2), body))
+    sys.stdout.write(
+        f'Dry mass:   {dry:.1f} t\n'
+        f'Total mass: {full:.1f} t\n'
+        f'Δv (atm):   {floor(_dv(dry, full, isp_atm))} m/s\n'
+        f'Δv (vac):   {floor(_dv(dry, full, isp_vac))} m/s\n'
+        f'TWR (atm):  {_twr(g0, full, thr_atm):.2f} ({body})\n'
+        f'TWR (vac):  {_twr(g0, full, thr_vac):.2f} ({body})\n')
 
 
-@click.command()
-@click.argument('engine', type=click.Choice(KSP_ENGINES.keys()))
 def mass_flow(engine):
     """Compute mass flow values for given engine."""
-    result = (
-        KSP_ENGINES[engine]['thrust_{}'.format('vac')] /
-        (KSP_ENGINES[engine]['isp_{}'.format('vac')] * KSP_G0))
+    result = _ENG[engine][1] / (_ENG[engine][3] * KSP_G0)
+
+    sys.stdout.write(f'Mass flow: {result:.3f}\n')
+
+
+#: Sub-command name to handler mapping
+COMMANDS = {
+    'dv': dv,
+    'twr': twr,
+    'orbital_spd': orbital_spd,
+    'stage': stage,
+    'mass_flow': mass_flow,
+}
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    sp = parser.add_subparsers(dest='cmd', metavar='COMMAND')
+    sp.required = True
+
+    p = sp.add_parser('dv', help=dv.__doc__)
+    p.add_argument('empty', type=float)
+    p.add_argument('full', type=float)
+    p.add_argument('isp', type=float)
+
+    p = sp.add_parser('twr', help=twr.__doc__)
+    p.add_argument('body', choices=KSP_BODIES.keys())
+    p.add_argument('mass', type=float)
+    p.add_argument('thrust', type=float)
+
+    p = sp.add_parser('orbital_spd', help=orbital_spd.__doc__)
+    p.add_argument('body', choices=KSP_BODIES.keys())
+    p.add_argument('height', type=float)
 
-    print('Mass flow: {}'.format(round(result, 3)))
+    p = sp.add_parser('stage', help=stage.__doc__)
+    p.add_argument('payload', type=float)
+    p.add_argument('tank_dry', type=float)
+    p.add_argument('tank_full', type=float)
+    p.add_argument('n_tanks', type=float)
+    p.add_argument('engines', choices=KSP_ENGINES.keys(), nargs='+')
+    p.add_argument('--body', choices=KSP_BODIES.keys(), default='kerbin')
 
+    p = sp.add_parser('mass_flow', help=mass_flow.__doc__)
+    p.add_argument('engine', choices=KSP_ENGINES.keys())
 
-cli.add_command(dv)
-cli.add_command(twr)
-cli.add_command(stage)
-cli.add_command(mass_flow)
-cli.add_command(orbital_spd)
+    args = vars(parser.parse_args(argv))
+    COMMANDS[args.pop('cmd')](**args)
 
 
 if __name__ == '__main__':